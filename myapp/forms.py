@@ -1,47 +1,52 @@
 from django import forms
 from django.contrib.auth.models import User
+from django.db.models import Q
 from .models import Book, UserProfile, Category, Author
 
+# Shared widget attrs; Widget.__init__ copies attrs, so sharing them is safe
+FORM_CONTROL = {'class': 'form-control'}
+FORM_SELECT = {'class': 'form-select'}
+
 class BookForm(forms.ModelForm):
     class Meta:
         model = Book
         fields = ['image', 'title', 'author', 'category', 'description', 'copies']
         widgets = {
             'title': forms.TextInput(attrs={
-                'class': 'form-control', 
+                **FORM_CONTROL,
                 'placeholder': 'Enter book title'
             }),
-            'author': forms.Select(attrs={
-                'class': 'form-select'
-            }),
-            'category': forms.Select(attrs={
-                'class': 'form-select'
-            }),
+            'author': forms.Select(attrs=FORM_SELECT),
+            'category': forms.Select(attrs=FORM_SELECT),
             'description': forms.Textarea(attrs={
-                'class': 'form-control', 
+                **FORM_CONTROL,
                 'rows': 4,
                 'placeholder': 'Enter book description'
             }),
             'copies': forms.NumberInput(attrs={
-                'class': 'form-control',
+                **FORM_CONTROL,
                 'min': 1
             }),
-            'image': forms.ClearableFileInput(attrs={
-                'class': 'form-control'
-            }),
+            'image': forms.ClearableFileInput(attrs=FORM_CONTROL),
         }
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Options only render __str__ (the name); skip biography/description
+        self.fields['author'].queryset = Author.objects.only('id', 'name')
+        self.fields['category'].queryset = Category.objects.only('id', 'name')
+
 class CategoryForm(forms.ModelForm):
     class Meta:
         model = Category
         fields = ['name', 'description']
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'form-control', 
+                **FORM_CONTROL,
                 'placeholder': 'Enter category name'
             }),
             'description': forms.Textarea(attrs={
-                'class': 'form-control', 
+                **FORM_CONTROL,
                 'rows': 3,
                 'placeholder': 'Enter category description (optional)'
             }),
@@ -53,11 +58,11 @@ class AuthorForm(forms.ModelForm):
         fields = ['name', 'biography']
         widgets = {
             'name': forms.TextInput(attrs={
-                'class': 'form-control', 
+                **FORM_CONTROL,
                 'placeholder': 'Enter author name'
             }),
             'biography': forms.Textarea(attrs={
-                'class': 'form-control', 
+                **FORM_CONTROL,
                 'rows': 4,
                 'placeholder': 'Enter author biography (optional)'
             }),
@@ -68,23 +73,52 @@ class UserProfileForm(forms.ModelForm):
         model = UserProfile
         fields = ['address', 'phone_number', 'profile_image']
         widgets = {
-            'address': forms.Textarea(attrs={'rows': 3, 'class': 'form-control'}),
-            'phone_number': forms.TextInput(attrs={'class': 'form-control', 'placeholder': '+1234567890'}),
-            'profile_image': forms.ClearableFileInput(attrs={'class': 'form-control'}),
+            'address': forms.Textarea(attrs={**FORM_CONTROL, 'rows': 3}),
+            'phone_number': forms.TextInput(attrs={**FORM_CONTROL, 'placeholder': '+1234567890'}),
+            'profile_image': forms.ClearableFileInput(attrs=FORM_CONTROL),
         }
 
+def check_existing_user(form, instance=None):
+    """
+    Look up clashing usernames and emails in one query and attach the errors
+    to the matching fields. When editing, the user itself is excluded and an
+    unchanged email is not checked, so legacy duplicates can still be saved.
+    """
+    username = form.cleaned_data.get('username', '')
+    email = form.cleaned_data.get('email', '')
+    if instance and email.lower() == (instance.email or '').lower():
+        email = ''
+    lookup = Q()
+    if username:
+        lookup |= Q(username__iexact=username)
+    if email:
+        lookup |= Q(email__iexact=email)
+    if not lookup:
+        return
+
+    username_taken = email_taken = False
+    rows = User.objects.filter(lookup).exclude(id=instance.id if instance else None).values_list('username', 'email')
+    for existing_username, existing_email in rows:
+        username_taken = username_taken or existing_username.lower() == username.lower()
+        email_taken = email_taken or bool(email) and existing_email.lower() == email.lower()
+
+    if username_taken:
+        form.add_error('username', "A user with that username already exists.")
+    if email_taken:
+        form.add_error('email', "A user with that email already exists.")
+
 class UserForm(forms.Form):
     username = forms.CharField(max_length=150, 
-                              widget=forms.TextInput(attrs={'class': 'form-control'}))
+                              widget=forms.TextInput(attrs=FORM_CONTROL))
     email = forms.EmailField(required=False,
-                            widget=forms.EmailInput(attrs={'class': 'form-control'}))
+                            widget=forms.EmailInput(attrs=FORM_CONTROL))
     password = forms.CharField(
-        widget=forms.PasswordInput(attrs={'class': 'form-control'}),
+        widget=forms.PasswordInput(attrs=FORM_CONTROL),
         required=False,
         label="Password (leave blank to keep current)"
     )
     password_confirm = forms.CharField(
-        widget=forms.PasswordInput(attrs={'class': 'form-control'}),
+        widget=forms.PasswordInput(attrs=FORM_CONTROL),
         required=False,
         label="Confirm Password"
     )
@@ -97,14 +131,9 @@ class UserForm(forms.Form):
             self.fields['username'].initial = self.instance.username
             self.fields['email'].initial = self.instance.email
 
-    def clean_username(self):
-        username = self.cleaned_data['username']
-        if User.objects.filter(username__iexact=username).exclude(id=self.instance.id if self.instance else None).exists():
-            raise forms.ValidationError("A user with that username already exists.")
-        return username
-
     def clean(self):
         cleaned_data = super().clean()
+        check_existing_user(self, instance=self.instance)
         password = cleaned_data.get('password')
         password_confirm = cleaned_data.get('password_confirm')
         
@@ -114,20 +143,15 @@ class UserForm(forms.Form):
 
 class SimpleRegisterForm(forms.Form):
     username = forms.CharField(max_length=150, 
-                              widget=forms.TextInput(attrs={'class': 'form-control'}))
+                              widget=forms.TextInput(attrs=FORM_CONTROL))
     email = forms.EmailField(required=False,
-                            widget=forms.EmailInput(attrs={'class': 'form-control'}))
-    password = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'form-control'}))
-    password_confirm = forms.CharField(widget=forms.PasswordInput(attrs={'class': 'form-control'}))
-
-    def clean_username(self):
-        username = self.cleaned_data['username']
-        if User.objects.filter(username__iexact=username).exists():
-            raise forms.ValidationError("A user with that username already exists.")
-        return username
+                            widget=forms.EmailInput(attrs=FORM_CONTROL))
+    password = forms.CharField(widget=forms.PasswordInput(attrs=FORM_CONTROL))
+    password_confirm = forms.CharField(widget=forms.PasswordInput(attrs=FORM_CONTROL))
 
     def clean(self):
         cleaned_data = super().clean()
+        check_existing_user(self)
         password = cleaned_data.get("password")
         password_confirm = cleaned_data.get("password_confirm")
         
@@ -0,0 +1,13 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class TunedArgon2PasswordHasher(Argon2PasswordHasher):
+    """
+    Argon2id with a lighter memory/thread budget than Django's default, so a
+    burst of registrations does not tie up every core. Existing argon2 hashes
+    are re-hashed with these parameters on the next login.
+    """
+
+    time_cost = 2
+    memory_cost = 64 * 1024
+    parallelism = 4
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-15 21:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['-created_at', '-id'], name='book_created_desc_idx'),
+        ),
+    ]
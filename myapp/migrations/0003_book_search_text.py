@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-15 22:00
+
+from django.db import migrations, models
+
+
+# Frozen copy of myapp.models.book_search_text as of this migration
+def book_search_text(book):
+    parts = [book.title, book.description, book.author.name, book.category.name]
+    return '\n'.join(part for part in parts if part).lower()
+
+
+def populate_search_text(apps, schema_editor):
+    Book = apps.get_model('myapp', 'Book')
+    books = list(Book.objects.select_related('author', 'category'))
+    for book in books:
+        book.search_text = book_search_text(book)
+    Book.objects.bulk_update(books, ['search_text'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0002_book_book_created_desc_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='book',
+            name='search_text',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.RunPython(populate_search_text, migrations.RunPython.noop),
+    ]
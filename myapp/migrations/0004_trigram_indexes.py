@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.db import migrations
+
+
+# (index name, model, indexed expression). Django runs icontains on PostgreSQL
+# as UPPER("col"::text) LIKE UPPER(%s), so those columns are indexed on that
+# expression; search_text is queried with a plain contains.
+TRIGRAM_INDEXES = [
+    ('book_search_text_trgm', ('myapp', 'Book'), '"search_text"'),
+    ('book_title_trgm', ('myapp', 'Book'), 'UPPER("title"::text)'),
+    ('author_name_trgm', ('myapp', 'Author'), 'UPPER("name"::text)'),
+    ('category_name_trgm', ('myapp', 'Category'), 'UPPER("name"::text)'),
+    ('userprofile_address_trgm', ('myapp', 'UserProfile'), 'UPPER("address"::text)'),
+    ('user_username_trgm', settings.AUTH_USER_MODEL.split('.'), 'UPPER("username"::text)'),
+    ('user_email_trgm', settings.AUTH_USER_MODEL.split('.'), 'UPPER("email"::text)'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm only exists on PostgreSQL; other backends keep sequential scans
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, model, expression in TRIGRAM_INDEXES:
+        table = apps.get_model(*model)._meta.db_table
+        schema_editor.execute(
+            'CREATE INDEX IF NOT EXISTS %s ON %s USING gin (%s gin_trgm_ops)'
+            % (name, schema_editor.quote_name(table), expression)
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, model, expression in TRIGRAM_INDEXES:
+        schema_editor.execute('DROP INDEX IF EXISTS %s' % name)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0003_book_search_text'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+
+def create_username_ci_index(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    # Users made through createsuperuser or the admin never went through the
+    # form's case-insensitive check, so clashes may already exist
+    clashes = list(
+        User.objects.annotate(username_lower=Lower('username'))
+        .values('username_lower')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+        .values_list('username_lower', flat=True)
+    )
+    if clashes:
+        raise RuntimeError(
+            'Cannot add a case-insensitive unique index on usernames: these '
+            'usernames exist in more than one letter case: %s. Rename or '
+            'delete the duplicates and run migrate again.' % ', '.join(sorted(clashes))
+        )
+    schema_editor.execute(
+        'CREATE UNIQUE INDEX user_username_ci_uniq ON %s (LOWER(username))'
+        % schema_editor.quote_name(User._meta.db_table)
+    )
+
+
+def drop_username_ci_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX user_username_ci_uniq')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0004_trigram_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # auth.User belongs to django.contrib.auth, so its case-insensitive
+    # uniqueness is enforced with a functional index created from here
+    operations = [
+        migrations.RunPython(create_username_ci_index, drop_username_ci_index),
+    ]
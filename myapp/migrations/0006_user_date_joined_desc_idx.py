@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_date_joined_index(apps, schema_editor):
+    table = schema_editor.quote_name(apps.get_model(*settings.AUTH_USER_MODEL.split('.'))._meta.db_table)
+    # CONCURRENTLY avoids locking auth_user on PostgreSQL; other backends lack it
+    concurrently = 'CONCURRENTLY ' if schema_editor.connection.vendor == 'postgresql' else ''
+    schema_editor.execute(
+        'CREATE INDEX %sIF NOT EXISTS user_date_joined_desc_idx ON %s (date_joined DESC)'
+        % (concurrently, table)
+    )
+
+
+def drop_date_joined_index(apps, schema_editor):
+    schema_editor.execute('DROP INDEX IF EXISTS user_date_joined_desc_idx')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('myapp', '0005_user_username_ci_uniq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    # auth.User belongs to django.contrib.auth, so the index backing the
+    # user list's ORDER BY -date_joined is created from here
+    operations = [
+        migrations.RunPython(create_date_joined_index, drop_date_joined_index),
+    ]
@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import post_save, pre_save
 from django.dispatch import receiver
 
 class Category(models.Model):
@@ -33,9 +34,14 @@ class Book(models.Model):
     description = models.TextField(blank=True, null=True)
     copies = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
+    # Lowercased title/description/author/category, kept in sync by signals below
+    search_text = models.TextField(blank=True, default='', editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='book_created_desc_idx'),
+        ]
     
     def __str__(self):
         return self.title
@@ -53,12 +59,59 @@ class UserProfile(models.Model):
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.get_or_create(user=instance)
-    
-@receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
+        UserProfile.objects.create(user=instance)
+
+def book_search_text(book):
+    # Newline-separated so a search term cannot match across two fields
+    parts = [book.title, book.description, book.author.name, book.category.name]
+    return '\n'.join(part for part in parts if part).lower()
+
+@receiver(pre_save, sender=Book)
+def update_book_search_text(sender, instance, **kwargs):
+    instance.search_text = book_search_text(instance)
+
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Category)
+def refresh_book_search_text(sender, instance, created, raw, update_fields, **kwargs):
+    # Only a rename changes the books' text
+    if created or raw or (update_fields is not None and 'name' not in update_fields):
+        return
+    books = list(instance.book_set.select_related('author', 'category'))
+    for book in books:
+        book.search_text = book_search_text(book)
+    Book.objects.bulk_update(books, ['search_text'])
+
+
+# Bumped once per write transaction; the cached list/search pages embed it in
+# their cache key, so a write makes their old copies unreachable
+LISTING_CACHE_VERSION_KEY = 'listing_cache_version'
+
+def _incr_listing_cache_version():
     try:
-        profile = instance.userprofile
-        profile.save()
-    except UserProfile.DoesNotExist:
-        UserProfile.objects.get_or_create(user=instance)
\ No newline at end of file
+        cache.incr(LISTING_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(LISTING_CACHE_VERSION_KEY, 1, None)
+
+def bump_listing_cache_version():
+    """
+    Schedule one version bump for when the current transaction commits (right
+    away in autocommit). Repeated calls inside the same transaction collapse
+    into one; a rollback discards the pending bump along with the writes.
+    """
+    connection = transaction.get_connection()
+    if any(func is _incr_listing_cache_version for _, func, _ in connection.run_on_commit):
+        return
+    transaction.on_commit(_incr_listing_cache_version)
+
+# Deletes are bumped by the delete views instead: a post_delete receiver
+# would switch off Django's fast-delete path for cascades
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=Author)
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=UserProfile)
+def bump_listing_cache_on_save(sender, update_fields=None, **kwargs):
+    # Logins only touch last_login, which no listing shows
+    if update_fields is not None and set(update_fields) == {'last_login'}:
+        return
+    bump_listing_cache_version()
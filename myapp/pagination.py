@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+class FastCountPaginator(Paginator):
+    """
+    Paginator that stops counting after count_limit rows, so a broad search
+    does not scan every match just to print the total.
+    """
+
+    count_limit = 1000
+
+    @cached_property
+    def _limited_count(self):
+        return self.object_list[:self.count_limit + 1].count()
+
+    @property
+    def count(self):
+        return min(self._limited_count, self.count_limit)
+
+    @property
+    def count_capped(self):
+        return self._limited_count > self.count_limit
+
+
+class KeysetPage:
+    """
+    One page of results addressed by the (created_at, id) of its edge rows
+    instead of an OFFSET, so deep pages cost the same as the first one.
+    """
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    @property
+    def next_cursor(self):
+        return encode_cursor(self.object_list[-1]) if self.object_list else ''
+
+    @property
+    def previous_cursor(self):
+        return encode_cursor(self.object_list[0]) if self.object_list else ''
+
+
+def encode_cursor(obj):
+    return f'{obj.created_at.isoformat()}_{obj.pk}'
+
+
+def decode_cursor(cursor):
+    """
+    Return (created_at, pk) for a cursor, or None if it is missing or malformed
+    """
+    value, _, pk = (cursor or '').rpartition('_')
+    try:
+        created_at, pk = datetime.fromisoformat(value), int(pk)
+    except ValueError:
+        return None
+    # encode_cursor always emits aware datetimes when USE_TZ is on
+    if settings.USE_TZ and timezone.is_naive(created_at):
+        return None
+    return created_at, pk
+
+
+def keyset_page(queryset, after=None, before=None, per_page=10):
+    """
+    Slice a queryset newest-first on (-created_at, -id) starting right after
+    (or right before) the row a cursor points at. Falls back to the first
+    page when no valid cursor is given.
+    """
+    after = decode_cursor(after)
+    before = decode_cursor(before) if not after else None
+
+    if before:
+        created_at, pk = before
+        rows = list(
+            queryset.filter(Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk))
+            .order_by('created_at', 'id')[:per_page + 1]
+        )
+        has_previous = len(rows) > per_page
+        return KeysetPage(rows[:per_page][::-1], has_next=bool(rows), has_previous=has_previous)
+
+    if after:
+        created_at, pk = after
+        queryset = queryset.filter(Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk))
+    rows = list(queryset.order_by('-created_at', '-id')[:per_page + 1])
+    return KeysetPage(rows[:per_page], has_next=len(rows) > per_page, has_previous=bool(after))
@@ -1,3 +1,175 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .forms import SimpleRegisterForm, UserForm
+from .models import Author, Book, Category
+from .pagination import FastCountPaginator, encode_cursor, keyset_page
+
+
+class KeysetPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        author = Author.objects.create(name='Author')
+        category = Category.objects.create(name='Category')
+        start = timezone.now()
+        for i in range(25):
+            book = Book.objects.create(title=f'Book {i}', author=author, category=category, copies=1)
+            # Two books per timestamp so the id tie-breaker is exercised
+            Book.objects.filter(pk=book.pk).update(created_at=start + timedelta(minutes=i // 2))
+        cls.newest_first = list(Book.objects.order_by('-created_at', '-id'))
+
+    def test_first_page(self):
+        page = keyset_page(Book.objects.all())
+        self.assertEqual(list(page), self.newest_first[:10])
+        self.assertTrue(page.has_next)
+        self.assertFalse(page.has_previous)
+
+    def test_next_pages(self):
+        page = keyset_page(Book.objects.all())
+        page = keyset_page(Book.objects.all(), after=page.next_cursor)
+        self.assertEqual(list(page), self.newest_first[10:20])
+        page = keyset_page(Book.objects.all(), after=page.next_cursor)
+        self.assertEqual(list(page), self.newest_first[20:])
+        self.assertFalse(page.has_next)
+        self.assertTrue(page.has_previous)
+
+    def test_previous_page(self):
+        page = keyset_page(Book.objects.all(), after=encode_cursor(self.newest_first[19]))
+        page = keyset_page(Book.objects.all(), before=page.previous_cursor)
+        self.assertEqual(list(page), self.newest_first[10:20])
+        self.assertTrue(page.has_next)
+        self.assertTrue(page.has_previous)
+        page = keyset_page(Book.objects.all(), before=page.previous_cursor)
+        self.assertEqual(list(page), self.newest_first[:10])
+        self.assertFalse(page.has_previous)
+
+    def test_before_newest_row_is_empty(self):
+        page = keyset_page(Book.objects.all(), before=encode_cursor(self.newest_first[0]))
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_next)
+        self.assertFalse(page.has_other_pages)
+
+    def test_malformed_cursor_falls_back_to_first_page(self):
+        for cursor in ['garbage', '2026-10-15_x', '2026-10-15_5', '_5']:
+            page = keyset_page(Book.objects.all(), after=cursor)
+            self.assertEqual(list(page), self.newest_first[:10])
+            self.assertFalse(page.has_previous)
+
+
+class BookSearchTextTests(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name='J.K. Rowling')
+        self.category = Category.objects.create(name='Fantasy')
+        self.book = Book.objects.create(
+            title='The Wizard', description='A boy wizard', author=self.author,
+            category=self.category, copies=1,
+        )
+
+    def test_book_save_builds_search_text(self):
+        self.assertEqual(self.book.search_text, 'the wizard\na boy wizard\nj.k. rowling\nfantasy')
+        self.book.title = 'The Sorcerer'
+        self.book.save()
+        self.book.refresh_from_db()
+        self.assertTrue(self.book.search_text.startswith('the sorcerer\n'))
+
+    def test_terms_do_not_match_across_fields(self):
+        self.assertFalse(Book.objects.filter(search_text__contains='wizard j.k.').exists())
+
+    def test_author_and_category_rename_refresh_books(self):
+        self.author.name = 'Robert Galbraith'
+        self.author.save()
+        self.category.name = 'Mystery'
+        self.category.save()
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.search_text, 'the wizard\na boy wizard\nrobert galbraith\nmystery')
+
+    def test_biography_only_save_leaves_books_alone(self):
+        self.author.biography = 'British author'
+        with self.assertNumQueries(1):
+            self.author.save(update_fields=['biography'])
+
+
+class SearchViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('wizard_fan', 'fan@example.com', 'secret')
+        author = Author.objects.create(name='Ursula Le Guin')
+        category = Category.objects.create(name='Fantasy')
+        Book.objects.create(title='A Wizard of Earthsea', author=author, category=category, copies=1)
+        Book.objects.create(title='The Dispossessed', author=author, category=category, copies=1)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_books_and_users_blocks(self):
+        response = self.client.get(reverse('search'), {'q': 'wiz'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([book.title for book in response.context['books']], ['A Wizard of Earthsea'])
+        self.assertEqual([user.username for user in response.context['users']], ['wizard_fan'])
+        self.assertEqual(response.context['authors'], [])
+        self.assertEqual(response.context['categories'], [])
+
+    def test_type_limits_blocks(self):
+        response = self.client.get(reverse('search'), {'q': 'wiz', 'type': 'books'})
+        self.assertEqual(len(response.context['books']), 1)
+        self.assertIsNone(response.context['users'])
+
+
+class ExistingUserCheckTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice', 'shared@example.com')
+        # Legacy account from before emails were checked for uniqueness
+        cls.bob = User.objects.create_user('bob', 'Shared@example.com')
+
+    def test_register_rejects_taken_username_and_email(self):
+        form = SimpleRegisterForm(data={
+            'username': 'ALICE', 'email': 'SHARED@example.com',
+            'password': 'secret', 'password_confirm': 'secret',
+        })
+        self.assertFalse(form.is_valid())
+        self.assertIn('username', form.errors)
+        self.assertIn('email', form.errors)
+
+    def test_edit_keeps_own_username_and_email(self):
+        form = UserForm(data={'username': 'Alice', 'email': 'shared@example.com'}, instance=self.alice)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_edit_keeps_unchanged_legacy_duplicate_email(self):
+        form = UserForm(data={'username': 'bob', 'email': 'shared@EXAMPLE.com'}, instance=self.bob)
+        self.assertTrue(form.is_valid(), form.errors)
+
+    def test_edit_rejects_changing_to_taken_email(self):
+        carol = User.objects.create_user('carol', 'carol@example.com')
+        form = UserForm(data={'username': 'carol', 'email': 'shared@example.com'}, instance=carol)
+        self.assertFalse(form.is_valid())
+        self.assertIn('email', form.errors)
+        self.assertNotIn('username', form.errors)
+
+
+class UserSearchPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('admin', 'admin@example.com', 'secret')
+        User.objects.bulk_create(
+            User(username=f'reader{i:02}', email=f'reader{i:02}@example.com') for i in range(25)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_page_links_keep_search_params(self):
+        response = self.client.get(reverse('user_search'), {'q': 'reader', 'filter': 'username'})
+        self.assertContains(response, 'href="?q=reader&amp;filter=username&page=2"')
+        self.assertContains(response, 'Page 1 of 3</span>')
 
-# Create your tests here.
+    def test_capped_count_shows_plus(self):
+        with mock.patch.object(FastCountPaginator, 'count_limit', 20):
+            response = self.client.get(reverse('user_search'), {'q': 'reader'})
+        self.assertContains(response, 'of 20+ users')
+        self.assertContains(response, 'Page 1 of 2+</span>')
@@ -1,25 +1,69 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.contrib import messages
-from django.db.models import Q
-from django.db import transaction, IntegrityError
-from .models import Book, UserProfile, Category, Author
+from django.db.models import Q, Count
+from django.db import close_old_connections, connection, transaction, IntegrityError
+from .models import (
+    Book, UserProfile, Category, Author,
+    LISTING_CACHE_VERSION_KEY, bump_listing_cache_version,
+)
 from .forms import (
     BookForm, SimpleRegisterForm, UserForm, UserProfileForm,
     CategoryForm, AuthorForm
 )
+from .pagination import FastCountPaginator, keyset_page
+from asgiref.sync import sync_to_async
 from django.core.paginator import Paginator
-from django.db.models import Prefetch
+from django.utils.http import urlencode
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+from django.views.decorators.vary import vary_on_headers
+
+
+def cache_listing(view):
+    """
+    Cache a list/search page for 30 seconds per URL and cookie. The key
+    carries the listing version that saves and the delete views bump, so
+    returning to a list after add/edit/delete does not get a pre-write copy.
+    The version lives in the default cache: with the per-process LocMemCache
+    that only holds within one worker process; configure a shared CACHES
+    backend (e.g. Redis) when running several.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        version = cache.get_or_set(LISTING_CACHE_VERSION_KEY, 0, None)
+        cached_view = cache_page(30, key_prefix=f'v1.{version}')(vary_on_headers('Cookie')(view))
+        return cached_view(request, *args, **kwargs)
+    return wrapper
+
+
+# Columns rendered by the list templates; everything else stays deferred
+BOOK_LIST_FIELDS = (
+    'id', 'title', 'image', 'description', 'copies', 'created_at',
+    'author__name', 'category__name',
+)
+USER_LIST_FIELDS = (
+    'id', 'username', 'email', 'date_joined',
+    'userprofile__address', 'userprofile__phone_number',
+    'userprofile__profile_image', 'userprofile__created_at',
+)
 
 
 # ================== ROOT / INDEX ==================
 def index(request):
     """
-    Root URL: redirect to login if not authenticated, else go home
+    Root URL: redirect to login if not authenticated, else go home.
+    Only checks for a session cookie; home's login_required does the real
+    check, so the session and user are not loaded twice.
     """
-    if request.user.is_authenticated:
+    if settings.SESSION_COOKIE_NAME in request.COOKIES:
         return redirect('home')
     return redirect('login')
 
@@ -60,13 +104,11 @@ def register(request):
             try:
                 with transaction.atomic():
                     user = form.save()
-                    # Ensure profile exists
-                    UserProfile.objects.get_or_create(user=user)
                     login(request, user)
                     messages.success(request, 'Registration successful!')
                     return redirect('home')
             except IntegrityError:
-                messages.error(request, 'Registration failed: Integrity error.')
+                messages.error(request, 'Registration failed: that username is already taken.')
             except Exception as e:
                 messages.error(request, f'Registration failed: {str(e)}')
         else:
@@ -86,17 +128,21 @@ def logout_view(request):
 
 # ================== USER PROFILE HELP ==================
 
-def get_user_profile_or_create(user):
-    profile, created = UserProfile.objects.get_or_create(user=user)
-    return profile
+def get_user_profile(user):
+    """
+    Profiles are created by the post_save signal; only users that predate it
+    may be missing one. Load the user with select_related('userprofile').
+    """
+    try:
+        return user.userprofile
+    except UserProfile.DoesNotExist:
+        return UserProfile.objects.create(user=user)
 
 
 # ================== USERS ==================
 @login_required
 def user_list(request):
-    users_qs = User.objects.order_by('-date_joined').prefetch_related(
-        Prefetch('userprofile', queryset=UserProfile.objects.all())
-    )
+    users_qs = User.objects.select_related('userprofile').only(*USER_LIST_FIELDS).order_by('-date_joined')
     paginator = Paginator(users_qs, 10)
     page_number = request.GET.get('page')
     users_page = paginator.get_page(page_number)
@@ -105,8 +151,8 @@ def user_list(request):
 
 @login_required
 def user_profile(request, pk):
-    user = get_object_or_404(User, pk=pk)
-    profile = get_user_profile_or_create(user)
+    user = get_object_or_404(User.objects.select_related('userprofile'), pk=pk)
+    profile = get_user_profile(user)
     return render(request, 'user_profile.html', {'user': user, 'profile': profile})
 
 
@@ -125,13 +171,15 @@ def add_user(request):
 
                     user = User.objects.create_user(username=username, email=email, password=password)
 
-                    profile = UserProfile.objects.get_or_create(user=user)[0]
+                    profile = user.userprofile  # created and cached by the post_save signal
                     profile.address = profile_form.cleaned_data.get('address', '') or ''
                     profile.phone_number = profile_form.cleaned_data.get('phone_number', '') or ''
+                    changed_fields = ['address', 'phone_number']
                     profile_image = profile_form.cleaned_data.get('profile_image', None)
                     if profile_image:
                         profile.profile_image = profile_image
-                    profile.save()
+                        changed_fields.append('profile_image')
+                    profile.save(update_fields=changed_fields)
 
                     messages.success(request, f'User "{user.username}" created successfully!')
                     return redirect('user_list')
@@ -140,12 +188,7 @@ def add_user(request):
             except Exception as e:
                 messages.error(request, f'Error creating user: {str(e)}')
         else:
-            for field, errs in user_form.errors.items():
-                for e in errs:
-                    messages.error(request, f'User {field}: {e}')
-            for field, errs in profile_form.errors.items():
-                for e in errs:
-                    messages.error(request, f'Profile {field}: {e}')
+            messages.error(request, 'Please fix the errors below.')
     else:
         user_form = UserForm()
         profile_form = UserProfileForm()
@@ -157,13 +200,12 @@ def add_user(request):
     })
 
 @login_required
+@cache_listing
 def user_search(request):
     query = request.GET.get('q', '').strip()
     filter_type = request.GET.get('filter', 'all')
     
-    users_qs = User.objects.prefetch_related(
-        Prefetch('userprofile', queryset=UserProfile.objects.all())
-    ).order_by('-date_joined')
+    users_qs = User.objects.select_related('userprofile').only(*USER_LIST_FIELDS).order_by('-date_joined')
     
     if query:
         if filter_type == 'username':
@@ -180,16 +222,20 @@ def user_search(request):
                 Q(userprofile__phone_number__icontains=query)
             )
     
-    paginator = Paginator(users_qs, 10)
+    paginator = FastCountPaginator(users_qs, 10)
     page_number = request.GET.get('page')
     users_page = paginator.get_page(page_number)
-    return render(request, 'user.html', {'users': users_page, 'search_query': query})
+    return render(request, 'user.html', {
+        'users': users_page,
+        'search_query': query,
+        'search_params': urlencode({'q': query, 'filter': filter_type}),
+    })
 
 
 @login_required
 def edit_user(request, pk):
-    user = get_object_or_404(User, pk=pk)
-    profile = get_user_profile_or_create(user)
+    user = get_object_or_404(User.objects.select_related('userprofile'), pk=pk)
+    profile = get_user_profile(user)
 
     if request.method == 'POST':
         user_form = UserForm(request.POST, instance=user)
@@ -201,9 +247,11 @@ def edit_user(request, pk):
                     user.username = user_form.cleaned_data['username']
                     user.email = user_form.cleaned_data.get('email', '')
                     password = user_form.cleaned_data.get('password', '')
+                    changed_fields = ['username', 'email']
                     if password:
                         user.set_password(password)
-                    user.save()
+                        changed_fields.append('password')
+                    user.save(update_fields=changed_fields)
                     profile_form.save()
                     messages.success(request, f'User "{user.username}" updated successfully!')
                     return redirect('user_list')
@@ -212,12 +260,7 @@ def edit_user(request, pk):
             except Exception as e:
                 messages.error(request, f'Error updating user: {str(e)}')
         else:
-            for field, errs in user_form.errors.items():
-                for e in errs:
-                    messages.error(request, f'User {field}: {e}')
-            for field, errs in profile_form.errors.items():
-                for e in errs:
-                    messages.error(request, f'Profile {field}: {e}')
+            messages.error(request, 'Please fix the errors below.')
     else:
         user_form = UserForm(instance=user)
         profile_form = UserProfileForm(instance=profile)
@@ -231,15 +274,16 @@ def edit_user(request, pk):
 
 @login_required
 def delete_user(request, pk):
-    user = get_object_or_404(User, pk=pk)
-    if request.user == user:
+    if request.user.pk == pk:
         messages.error(request, "You can't delete the currently logged in user.")
         return redirect('user_list')
 
+    user = get_object_or_404(User.objects.only('id', 'username'), pk=pk)
     if request.method == 'POST':
         try:
             username = user.username
             user.delete()
+            bump_listing_cache_version()
             messages.success(request, f'User "{username}" deleted successfully!')
         except Exception as e:
             messages.error(request, f'Error deleting user: {str(e)}')
@@ -248,12 +292,21 @@ def delete_user(request, pk):
 
 
 # ================== BOOKS ==================
+def stream_books(books=None):
+    """
+    Yield books 200 rows at a time (a server-side cursor on PostgreSQL) so
+    exports over the whole table never hold it all in memory
+    """
+    if books is None:
+        books = Book.objects.select_related('author', 'category').only(*BOOK_LIST_FIELDS)
+    yield from books.iterator(chunk_size=200)
+
+
 @login_required
+@cache_listing
 def book_list(request):
-    books = Book.objects.select_related('author', 'category').order_by('-created_at')
-    paginator = Paginator(books, 10)
-    page_number = request.GET.get('page')
-    books_page = paginator.get_page(page_number)
+    books = Book.objects.select_related('author', 'category').only(*BOOK_LIST_FIELDS)
+    books_page = keyset_page(books, after=request.GET.get('after'), before=request.GET.get('before'))
     return render(request, 'book.html', {'books': books_page})
 
 
@@ -290,11 +343,15 @@ def edit_book(request, pk):
 
 @login_required
 def delete_book(request, pk):
-    book = get_object_or_404(Book, pk=pk)
+    book = get_object_or_404(
+        Book.objects.select_related('author', 'category').only('id', 'title', 'author__name', 'category__name'),
+        pk=pk
+    )
     if request.method == 'POST':
         try:
             title = book.title
             book.delete()
+            bump_listing_cache_version()
             messages.success(request, f'Book "{title}" deleted successfully!')
         except Exception as e:
             messages.error(request, f'Error deleting book: {str(e)}')
@@ -311,11 +368,12 @@ def book_detail(request, pk):
 
 
 @login_required
+@cache_listing
 def book_search(request):
     query = request.GET.get('q', '').strip()
     filter_type = request.GET.get('filter', 'all')
     
-    books = Book.objects.select_related('author', 'category').order_by('-created_at')
+    books = Book.objects.select_related('author', 'category').only(*BOOK_LIST_FIELDS)
     
     if query:
         if filter_type == 'title':
@@ -325,25 +383,23 @@ def book_search(request):
         elif filter_type == 'category':
             books = books.filter(category__name__icontains=query)
         else:  
-            books = books.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(author__name__icontains=query) |
-                Q(category__name__icontains=query)
-            )
+            books = books.filter(search_text__contains=query.lower())
     
 
-    paginator = Paginator(books, 10)
-    page_number = request.GET.get('page')
-    books_page = paginator.get_page(page_number)
-    return render(request, 'book.html', {'books': books_page, 'search_query': query})
+    books_page = keyset_page(books, after=request.GET.get('after'), before=request.GET.get('before'))
+    return render(request, 'book.html', {
+        'books': books_page,
+        'search_query': query,
+        'search_params': urlencode({'q': query, 'filter': filter_type}),
+    })
 
 
 
 # ================== CATEGORIES ==================
 @login_required
+@cache_listing
 def category_list(request):
-    categories = Category.objects.order_by('name').all()
+    categories = Category.objects.annotate(book_count=Count('book')).order_by('name')
     paginator = Paginator(categories, 10)
     page_number = request.GET.get('page')
     categories_page = paginator.get_page(page_number)
@@ -384,11 +440,12 @@ def edit_category(request, pk):
 
 @login_required
 def delete_category(request, pk):
-    category = get_object_or_404(Category, pk=pk)
+    category = get_object_or_404(Category.objects.only('id', 'name'), pk=pk)
     if request.method == 'POST':
         try:
             name = category.name
             category.delete()
+            bump_listing_cache_version()
             messages.success(request, f'Category "{name}" deleted successfully!')
         except Exception as e:
             messages.error(request, f'Error deleting category: {str(e)}')
@@ -397,8 +454,27 @@ def delete_category(request, pk):
 
 
 # ================== SEARCH ==================
+# Long-lived workers for the search fan-out. Under WSGI each request gets a
+# fresh event loop whose default executor threads die with it, taking their
+# DB connections along; a shared pool keeps threads and connections reused.
+SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix='search')
+
+
+@sync_to_async(thread_sensitive=False, executor=SEARCH_EXECUTOR)
+def fetch_results(queryset):
+    """
+    Evaluate a queryset on a search worker thread with its own DB connection,
+    so several of these can run at the same time
+    """
+    close_old_connections()
+    try:
+        return list(queryset)
+    finally:
+        close_old_connections()
+
+
 @login_required
-def search(request):
+async def search(request):
     query = request.GET.get('q', '').strip()
     search_type = request.GET.get('type', 'all')
     
@@ -412,41 +488,50 @@ def search(request):
     }
     
     if query:
+        querysets = {}
         if search_type in ['all', 'books']:
             books = Book.objects.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(author__name__icontains=query) |
-                Q(category__name__icontains=query)
-            ).select_related('author', 'category').distinct()
-            context['books'] = books[:10]  # Limit to 10 results
+                search_text__contains=query.lower()
+            ).select_related('author', 'category')
+            querysets['books'] = books[:10]  # Limit to 10 results
             
         if search_type in ['all', 'users']:
             users = User.objects.filter(
                 Q(username__icontains=query) |
                 Q(email__icontains=query) |
                 Q(userprofile__address__icontains=query)
-            ).prefetch_related('userprofile').distinct()
-            context['users'] = users[:10]
+            ).select_related('userprofile')
+            querysets['users'] = users[:10]
             
         if search_type in ['all', 'authors']:
             authors = Author.objects.filter(
                 Q(name__icontains=query)
-            ).prefetch_related('book_set').distinct()
-            context['authors'] = authors[:10]
+            ).prefetch_related('book_set')
+            querysets['authors'] = authors[:10]
             
         if search_type in ['all', 'categories']:
             categories = Category.objects.filter(
                 Q(name__icontains=query)
-            ).prefetch_related('book_set').distinct()
-            context['categories'] = categories[:10]
+            ).prefetch_related('book_set')
+            querysets['categories'] = categories[:10]
+
+        if await sync_to_async(lambda: connection.in_atomic_block)():
+            # Inside an enclosing transaction (e.g. TestCase) other connections
+            # cannot see its writes, and SQLite locks them out; stay on the
+            # request's own connection, which lives on the sync thread
+            results = await sync_to_async(lambda: [list(qs) for qs in querysets.values()])()
+        else:
+            # Run the blocks concurrently: wall time is the slowest one, not the sum
+            results = await asyncio.gather(*(fetch_results(qs) for qs in querysets.values()))
+        context.update(zip(querysets, results))
     
-    return render(request, 'search_results.html', context)
+    return await sync_to_async(render)(request, 'search_results.html', context)
 
 # ================== AUTHORS ==================
 @login_required
+@cache_listing
 def author_list(request):
-    authors = Author.objects.prefetch_related('book_set').order_by('name').all()
+    authors = Author.objects.annotate(book_count=Count('book')).order_by('name')
     paginator = Paginator(authors, 10)
     page_number = request.GET.get('page')
     authors_page = paginator.get_page(page_number)
@@ -486,11 +571,12 @@ def edit_author(request, pk):
 
 @login_required
 def delete_author(request, pk):
-    author = get_object_or_404(Author, pk=pk)
+    author = get_object_or_404(Author.objects.only('id', 'name'), pk=pk)
     if request.method == 'POST':
         try:
             name = author.name
             author.delete()
+            bump_listing_cache_version()
             messages.success(request, f'Author "{name}" deleted successfully!')
         except Exception as e:
             messages.error(request, f'Error deleting author: {str(e)}')
@@ -500,14 +586,22 @@ def delete_author(request, pk):
 # ================== DASHBOARD ==================
 
 @login_required
+@cache_page(60)
+@vary_on_headers('Cookie')
 def dashboard(request):
-    total_users = User.objects.count()
-    total_books = Book.objects.count()
-    total_authors = Author.objects.count()
-    total_categories = Category.objects.count()
+    # One round-trip for all four totals instead of a COUNT(*) per model
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT (SELECT COUNT(*) FROM {}), (SELECT COUNT(*) FROM {}), '
+            '(SELECT COUNT(*) FROM {}), (SELECT COUNT(*) FROM {})'.format(
+                *(connection.ops.quote_name(model._meta.db_table)
+                  for model in (User, Book, Author, Category))
+            )
+        )
+        total_users, total_books, total_authors, total_categories = cursor.fetchone()
 
     recent_users = User.objects.order_by('-date_joined')[:5]
-    recent_books = Book.objects.order_by('-created_at')[:5]
+    recent_books = Book.objects.select_related('author', 'category').order_by('-created_at')[:5]
 
     context = {
         'total_users': total_users,
@@ -52,6 +52,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Reuse connections across requests instead of reconnecting every time
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
@@ -62,6 +65,25 @@ AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator'},
 ]
 
+# Argon2id first when argon2-cffi is installed; older PBKDF2 hashes still verify
+# and are upgraded on the user's next login
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+try:
+    import argon2  # noqa: F401
+except ImportError:
+    pass
+else:
+    # Both classes use algorithm 'argon2' and Django maps a name to the last
+    # hasher listed, so the stock entry would shadow the tuned one
+    PASSWORD_HASHERS.remove('django.contrib.auth.hashers.Argon2PasswordHasher')
+    PASSWORD_HASHERS.insert(0, 'myapp.hashers.TunedArgon2PasswordHasher')
+
 LANGUAGE_CODE = 'en-us'
 TIME_ZONE = 'UTC'
 USE_I18N = True
@@ -81,5 +103,19 @@ LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'home'
 LOGOUT_REDIRECT_URL = 'home'
 
-#  FIXED: Default file storage for images
-DEFAULT_FILE_STORAGE = 'django.core.files.storage.FileSystemStorage'
\ No newline at end of file
+# Storage for uploaded images: local filesystem by default. Setting
+# AWS_STORAGE_BUCKET_NAME switches to S3/R2 via django-storages so book covers
+# and profile images are served from the bucket/CDN instead of Django workers.
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+AWS_STORAGE_BUCKET_NAME = os.environ.get('AWS_STORAGE_BUCKET_NAME')
+if AWS_STORAGE_BUCKET_NAME:
+    STORAGES['default'] = {'BACKEND': 'storages.backends.s3.S3Storage'}
+    AWS_S3_ENDPOINT_URL = os.environ.get('AWS_S3_ENDPOINT_URL')  # e.g. Cloudflare R2
+    AWS_S3_CUSTOM_DOMAIN = os.environ.get('AWS_S3_CUSTOM_DOMAIN')  # CDN in front of the bucket
+    # Uploads keep unique names (no overwrite), so they can be cached forever
+    AWS_S3_FILE_OVERWRITE = False
+    AWS_S3_OBJECT_PARAMETERS = {'CacheControl': 'max-age=31536000, immutable'}
\ No newline at end of file